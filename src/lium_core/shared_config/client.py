@@ -1,8 +1,13 @@
+import hashlib
 import logging
+import os
+import random
 import threading
-import time
+from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from lium_core.shared_config.defaults import DEFAULT_SHARED_CONFIG
 from lium_core.shared_config.model import SharedConfig
@@ -10,57 +15,270 @@ from lium_core.shared_config.utils import dict_diff
 
 logger = logging.getLogger(__name__)
 
+# Returned by _fetch when the API reports the config has not changed.
+_UNCHANGED = object()
+
+# Upper bound (seconds) of random delay added to each refresh interval so
+# that many clients started together don't hit the API in lockstep.
+_REFRESH_JITTER = 5.0
+
+# How long (seconds) a caller waits for another client's in-flight fetch before
+# fetching itself. Longer than one fetch with retries (4 x 10s timeout + backoff).
+_INFLIGHT_WAIT_TIMEOUT = 60.0
+
+# Scalar fields mirrored as plain attributes on the client for cheap access.
+_SCALAR_FIELDS = (
+    "bittensor_netuid",
+    "rental_fees_rate",
+    "machine_max_price_rate",
+    "machine_min_price_rate",
+    "collateral_days",
+    "volume_gb_hour_price_usd",
+    "max_initial_port_count",
+    "total_burn_emission",
+    "collateral_contract_address",
+)
+
+
+class _FormattedChanges:
+    """Lazily renders dict_diff output, so formatting only happens if the log record is emitted."""
+
+    def __init__(self, changes: list[tuple[str, Any, Any]]) -> None:
+        self._changes = changes
+
+    def __str__(self) -> str:
+        return "\n".join(f"[{path}]: {old_val!r} -> {new_val!r}" for path, old_val, new_val in self._changes)
+
+
+class _InFlight:
+    """A fetch in progress for one API URL, whose result is shared with concurrent callers."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: SharedConfig | None = None
+
+
+def _drain(response: requests.Response) -> None:
+    """Read off any unconsumed body so closing the response returns its connection to the pool."""
+    for _ in response.iter_content(chunk_size=8192):
+        pass
+
 
 class SharedConfigClient:
+    # Single-flight registry: at most one HTTP fetch per API URL in this process.
+    _inflight: dict[str, _InFlight] = {}
+    _inflight_lock = threading.Lock()
+
+    # Mirrors of the SharedConfig scalars, each re-bound separately on refresh. A read
+    # of one is always current, but reads of several may mix old and new values; go
+    # through `config` for a consistent snapshot (e.g. min/max price rates together).
+    bittensor_netuid: int
+    rental_fees_rate: float
+    machine_max_price_rate: float
+    machine_min_price_rate: float
+    collateral_days: int
+    volume_gb_hour_price_usd: float
+    max_initial_port_count: int
+    total_burn_emission: float
+    collateral_contract_address: str
+
     def __init__(self, api_url: str, refresh_interval: int = 60):
         self._api_url = api_url
         self._refresh_interval = refresh_interval
-        self._lock = threading.Lock()
-        self._running = True
+        self._lock = threading.Lock()  # serializes writers only; reads don't lock
+        self._stop_event = threading.Event()
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._config_hash: bytes | None = None
+        self._fail_count = 0  # consecutive network failures
+        self._ready = threading.Event()
+
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "lium-core"
+        # Retry transient gateway errors on the pooled connection with backoff
+        # rather than staying on stale config until the next refresh interval.
+        # total=3 means up to 3 retries, i.e. at most 4 attempts per fetch.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
-        fetched = self._fetch()
-        if fetched:
-            logger.info("Shared config fetched from API: %s", self._api_url)
-            self._config = fetched
-        else:
-            logger.warning("Using default shared config (API unavailable: %s)", self._api_url)
-            self._config = DEFAULT_SHARED_CONFIG
+        # Serve defaults immediately; the refresh thread promotes the API config
+        # as soon as the first fetch succeeds, so startup never waits on the API.
+        self._set_config(DEFAULT_SHARED_CONFIG)
 
         self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
         self._thread.start()
 
     @property
     def config(self) -> SharedConfig:
-        with self._lock:
-            return self._config
+        # Lock-free: SharedConfig is immutable and only ever replaced by a single
+        # reference assignment, which is atomic under the GIL (and under
+        # free-threaded builds, where attribute stores are made thread-safe).
+        # A `config` read therefore always returns either the whole old or the
+        # whole new config. This does not extend to the mirrored scalar attributes.
+        return self._config
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """Block until config has been fetched from the API at least once.
+
+        Return False if the timeout expired first (defaults are still in use).
+        """
+        return self._ready.wait(timeout)
 
-    def _fetch(self) -> SharedConfig | None:
-        """Fetch config from API, return None on failure."""
+    def _set_config(self, config: SharedConfig) -> None:
+        """Publish a new config and re-bind the mirrored scalar attributes.
+
+        The scalars are re-bound one at a time after `_config` is swapped, so a
+        concurrent reader may briefly see some scalars from the old config and
+        some from the new. Callers reading related fields together must use
+        `config`.
+        """
+        self._config = config
+        for name in _SCALAR_FIELDS:
+            setattr(self, name, getattr(config, name))
+
+    def _fetch(self) -> SharedConfig | object | None:
+        """Fetch config from API, joining a fetch already in flight for the same URL.
+
+        Callers that join receive the leader's config rather than _UNCHANGED,
+        since the leader's conditional-request state isn't theirs. For the same
+        reason they drop their own validators and body hash once they adopt it:
+        those describe their previous config, and keeping them would turn a later
+        rollback to that config into a 304 / hash match reported as _UNCHANGED.
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(self._api_url)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._inflight[self._api_url] = _InFlight()
+        if not is_leader:
+            if not flight.done.wait(_INFLIGHT_WAIT_TIMEOUT):
+                logger.warning("Timed out waiting for in-flight shared config fetch from %s", self._api_url)
+                return self._fetch_from_api()
+            if flight.result is not None:
+                self._etag = self._last_modified = self._config_hash = None
+            return flight.result
+
+        result = None
         try:
-            response = requests.get(self._api_url, timeout=10)
-            response.raise_for_status()
-            return SharedConfig.model_validate(response.json())
+            result = self._fetch_from_api()
+            return result
+        finally:
+            flight.result = self._config if result is _UNCHANGED else result
+            with self._inflight_lock:
+                del self._inflight[self._api_url]
+            flight.done.set()
+
+    @classmethod
+    def _reset_inflight(cls) -> None:
+        """Forget in-flight fetches; run in forked children, where their threads don't exist."""
+        cls._inflight = {}
+        cls._inflight_lock = threading.Lock()
+
+    def _fetch_from_api(self) -> SharedConfig | object | None:
+        """Fetch config from API.
+
+        Return _UNCHANGED on 304 or when the body matches the last parsed one, None on failure.
+        """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        try:
+            # Stream the body so it is hashed while being read into a single buffer,
+            # which pydantic then parses and validates in one pass.
+            with self._session.get(self._api_url, headers=headers, timeout=10, stream=True) as response:
+                if response.status_code == 304:
+                    _drain(response)
+                    self._fail_count = 0
+                    return _UNCHANGED
+                if response.status_code >= 400:
+                    _drain(response)
+                response.raise_for_status()
+                body = bytearray()
+                hasher = hashlib.blake2b(digest_size=16)
+                for chunk in response.iter_content(chunk_size=8192):
+                    hasher.update(chunk)
+                    body += chunk
+                body_hash = hasher.digest()
+                if body_hash == self._config_hash:
+                    config = _UNCHANGED
+                else:
+                    config = SharedConfig.model_validate_json(body)
+                    self._config_hash = body_hash
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+                self._fail_count = 0
+                return config
+        except requests.RequestException as e:
+            # Network blips are expected; keep them to one line and only attach the
+            # traceback when debugging or every 10th consecutive failure.
+            self._fail_count += 1
+            logger.warning(
+                "Failed to fetch shared config from %s: %s: %s",
+                self._api_url,
+                type(e).__name__,
+                e,
+                exc_info=self._fail_count % 10 == 0 or logger.isEnabledFor(logging.DEBUG),
+            )
+            return None
         except Exception:
             logger.warning("Failed to fetch shared config from %s", self._api_url, exc_info=True)
             return None
 
     def _refresh_loop(self) -> None:
-        """Background daemon thread: sleep + fetch."""
+        """Background daemon thread: fetch immediately, then wait + fetch until stopped.
+
+        The session is closed here on exit rather than in stop(), so it is never
+        closed underneath an in-flight fetch.
+        """
         logger.info("Started shared config refresh loop")
-        while self._running:
-            time.sleep(self._refresh_interval)
-            try:
-                new_config = self._fetch()
-                with self._lock:
-                    if new_config and self._config != new_config:
-                        for change in dict_diff(self._config.model_dump(), new_config.model_dump()):
-                            logger.info("Config changed %s", change)
-                        self._config = new_config
-                    else:
-                        logger.debug("Shared config unchanged")
-            except Exception:
-                logger.exception("Unexpected error in shared config refresh loop")
+        try:
+            self._refresh()
+            if not self._ready.is_set():
+                logger.warning("Using default shared config (API unavailable: %s)", self._api_url)
+            while not self._stop_event.wait(self._refresh_interval + random.uniform(0, _REFRESH_JITTER)):
+                self._refresh()
+        finally:
+            self._session.close()
+
+    def _refresh(self) -> None:
+        """Fetch once and publish the result if it differs from the current config."""
+        try:
+            new_config = self._fetch()
+            with self._lock:
+                if isinstance(new_config, SharedConfig) and self._config != new_config:
+                    if logger.isEnabledFor(logging.INFO):
+                        changes = dict_diff(self._config.cached_dump(), new_config.cached_dump())
+                        if changes:
+                            logger.info("Config changed:\n%s", _FormattedChanges(changes))
+                    self._set_config(new_config)
+                else:
+                    logger.debug("Shared config unchanged")
+            if new_config is not None and not self._ready.is_set():
+                logger.info("Shared config fetched from API: %s", self._api_url)
+                self._ready.set()
+        except Exception:
+            logger.exception("Unexpected error in shared config refresh loop")
 
     def stop(self) -> None:
-        """Stop background refresh."""
-        self._running = False
+        """Signal the refresh thread to stop; returns without waiting for it.
+
+        The thread exits as soon as any in-flight fetch finishes and then releases
+        the pooled connections.
+        """
+        self._stop_event.set()
+
+
+# A child forked mid-fetch (e.g. gunicorn pre-fork) would otherwise inherit a
+# registry entry that is never completed, or a lock that is never released.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SharedConfigClient._reset_inflight)
@@ -1,5 +1,14 @@
+from bisect import bisect_right
+from collections.abc import Callable
+from typing import Any, Self, TypeVar
+
 from pydantic import BaseModel, ConfigDict
 
+_T = TypeVar("_T")
+
+# Instance __dict__ keys used by SharedConfig._memoize
+_MEMO_KEYS = ("_dump_cache", "_driver_index")
+
 
 class SharedConfig(BaseModel):
     model_config = ConfigDict(frozen=True)
@@ -20,3 +29,47 @@ class SharedConfig(BaseModel):
     volume_gb_hour_price_usd: float
     max_initial_port_count: int
     total_burn_emission: float
+
+    def _memoize(self, key: str, compute: Callable[[], _T]) -> _T:
+        """Compute a derived value on first use and keep it in the instance __dict__.
+
+        Like functools.cached_property, the entry lives outside the pydantic fields and
+        private attributes, so __eq__ ignores it (pydantic >= 2.6 compares only field
+        values from __dict__). Copies drop it (see __copy__).
+        """
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            value = self.__dict__[key] = compute()
+            return value
+
+    def __copy__(self) -> Self:
+        # model_copy(update=...) goes through here without revalidating; don't carry
+        # values derived from the original's fields over to the copy.
+        copied = super().__copy__()
+        copied._drop_memos()
+        return copied
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        copied = super().__deepcopy__(memo)
+        copied._drop_memos()
+        return copied
+
+    def _drop_memos(self) -> None:
+        for key in _MEMO_KEYS:
+            self.__dict__.pop(key, None)
+
+    def cached_dump(self) -> dict[str, Any]:
+        """Return model_dump() output, computed on first call. Shared; do not mutate."""
+        return self._memoize("_dump_cache", self.model_dump)
+
+    def lookup_driver_cuda(self, driver: int) -> float | None:
+        """Return the CUDA version of the highest known driver <= driver, or None if older than all."""
+        versions, cuda_versions = self._memoize("_driver_index", self._build_driver_index)
+        index = bisect_right(versions, driver)
+        return cuda_versions[index - 1] if index else None
+
+    def _build_driver_index(self) -> tuple[tuple[int, ...], tuple[float, ...]]:
+        """Split driver_cuda_map into parallel tuples sorted by driver version."""
+        drivers = sorted(self.driver_cuda_map.items())
+        return tuple(driver for driver, _ in drivers), tuple(cuda for _, cuda in drivers)
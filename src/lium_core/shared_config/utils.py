@@ -1,13 +1,35 @@
-def dict_diff(old: dict, new: dict, prefix: str = "") -> list[str]:
-    """Return list of human-readable strings describing differences."""
-    changes: list[str] = []
-    all_keys = old.keys() | new.keys()
-    for key in sorted(all_keys):
-        path = f"{prefix}.{key}" if prefix else key
-        old_val = old.get(key)
-        new_val = new.get(key)
-        if isinstance(old_val, dict) and isinstance(new_val, dict):
-            changes.extend(dict_diff(old_val, new_val, path))
-        elif old_val != new_val:
-            changes.append(f"[{path}]: {old_val} -> {new_val}")
-    return changes
+from typing import Any
+
+
+def _key_order(key: Any) -> tuple[int, Any]:
+    """Sort key for one path segment: numbers numerically, then everything else as text."""
+    if isinstance(key, (int, float)):
+        return 0, key
+    return 1, str(key)
+
+
+def dict_diff(old: dict, new: dict, prefix: str = "") -> list[tuple[str, Any, Any]]:
+    """Return list of (path, old_value, new_value) for every difference, sorted by path.
+
+    Walks nested dicts iteratively and skips any subtree that compares equal. Paths are
+    ordered by their original keys, so numeric keys keep numeric order.
+    """
+    changes: list[tuple[tuple, str, Any, Any]] = []
+    stack = [((_key_order(prefix),) if prefix else (), prefix, old, new)]
+    while stack:
+        order, base, old_sub, new_sub = stack.pop()
+        if old_sub == new_sub:
+            continue
+        for key in old_sub.keys() | new_sub.keys():
+            key_order = (*order, _key_order(key))
+            path = f"{base}.{key}" if base else str(key)
+            old_val = old_sub.get(key)
+            new_val = new_sub.get(key)
+            if old_val is new_val:
+                continue
+            if isinstance(old_val, dict) and isinstance(new_val, dict):
+                stack.append((key_order, path, old_val, new_val))
+            elif old_val != new_val:
+                changes.append((key_order, path, old_val, new_val))
+    changes.sort(key=lambda change: change[0])
+    return [(path, old_val, new_val) for _, path, old_val, new_val in changes]
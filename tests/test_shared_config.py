@@ -1,30 +1,56 @@
+import hashlib
+import json
 import logging
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pydantic
 import pytest
 import requests
 
-from lium_core.shared_config.client import SharedConfigClient
+from lium_core.shared_config.client import _UNCHANGED, SharedConfigClient, _InFlight
 from lium_core.shared_config.defaults import DEFAULT_SHARED_CONFIG
 from lium_core.shared_config.model import SharedConfig
 from lium_core.shared_config.utils import dict_diff
 
 API_URL = "http://fake-api/config"
 
-SAMPLE_CONFIG_DATA = DEFAULT_SHARED_CONFIG.model_dump()
 
-ALTERED_CONFIG_DATA = {
-    **SAMPLE_CONFIG_DATA,
-    "rental_fees_rate": 0.75,
-    "collateral_days": 14,
-}
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only MappingProxyType views."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
 
 
-def _make_response(json_data: dict, status_code: int = 200) -> MagicMock:
+def _to_json(data: Mapping) -> bytes:
+    return json.dumps(data, default=dict).encode()
+
+
+# Read-only at every level so no test can leak changes into the others
+SAMPLE_CONFIG_DATA = _freeze(DEFAULT_SHARED_CONFIG.model_dump())
+
+ALTERED_CONFIG_DATA = _freeze(
+    {
+        **SAMPLE_CONFIG_DATA,
+        "rental_fees_rate": 0.75,
+        "collateral_days": 14,
+    }
+)
+
+
+def _make_response(json_data: Mapping, status_code: int = 200, headers: dict | None = None) -> MagicMock:
     resp = MagicMock(spec=requests.Response)
     resp.status_code = status_code
-    resp.json.return_value = json_data
+    resp.headers = headers or {}
+    resp.__enter__.return_value = resp
+    resp.iter_content.return_value = [_to_json(json_data)]
     resp.raise_for_status.return_value = None
     if status_code >= 400:
         resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
@@ -32,12 +58,70 @@ def _make_response(json_data: dict, status_code: int = 200) -> MagicMock:
 
 
 def _build_client(mock_get: MagicMock) -> SharedConfigClient:
-    """Create client with patched threading so no background loop runs."""
-    with patch("lium_core.shared_config.client.threading"):
+    """Create client with patched Thread so no background loop runs, then do the initial refresh inline."""
+    with patch("lium_core.shared_config.client.threading.Thread"):
         client = SharedConfigClient(api_url=API_URL, refresh_interval=60)
+    client._refresh()
     return client
 
 
+@pytest.fixture(scope="module")
+def default_client() -> Iterator[SharedConfigClient]:
+    """Client loaded with SAMPLE_CONFIG_DATA, shared by tests that only read from it."""
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=_make_response(SAMPLE_CONFIG_DATA)):
+        client = _build_client(MagicMock())
+    yield client
+    client.stop()
+
+
+def _fetch_concurrently(
+    leader: SharedConfigClient, follower: SharedConfigClient, response: MagicMock, follower_refresh: bool = False
+) -> tuple[object, object, MagicMock]:
+    """Run leader._fetch() blocked inside Session.get while the follower joins the same flight.
+
+    The follower calls _fetch(), or _refresh() if follower_refresh is set, in which case
+    its published config is returned as its result.
+    """
+    entered, release, follower_waiting = threading.Event(), threading.Event(), threading.Event()
+
+    def _blocking_get(*args: object, **kwargs: object) -> MagicMock:
+        entered.set()
+        release.wait(timeout=5)
+        return response
+
+    results: dict[str, object] = {}
+    mock_get = MagicMock(side_effect=_blocking_get)
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        leader_thread = threading.Thread(target=lambda: results.update(leader=leader._fetch()))
+        leader_thread.start()
+        assert entered.wait(timeout=5)
+
+        done = SharedConfigClient._inflight[API_URL].done
+        wait = done.wait
+
+        def _signalling_wait(timeout: float | None = None) -> bool:
+            follower_waiting.set()
+            return wait(timeout)
+
+        done.wait = _signalling_wait
+
+        def _follow() -> None:
+            if follower_refresh:
+                follower._refresh()
+                results["follower"] = follower.config
+            else:
+                results["follower"] = follower._fetch()
+
+        follower_thread = threading.Thread(target=_follow)
+        follower_thread.start()
+        assert follower_waiting.wait(timeout=5)
+
+        release.set()
+        leader_thread.join(timeout=5)
+        follower_thread.join(timeout=5)
+    return results["leader"], results["follower"], mock_get
+
+
 # ==================== Model tests ====================
 
 
@@ -70,6 +154,79 @@ def test_shared_config_serializes_to_json() -> None:
     assert isinstance(data["gpu_architectures"]["NVIDIA B200"]["arch"], str)
 
 
+def test_cached_dump_matches_model_dump() -> None:
+    assert DEFAULT_SHARED_CONFIG.cached_dump() == DEFAULT_SHARED_CONFIG.model_dump()
+    assert DEFAULT_SHARED_CONFIG.cached_dump() is DEFAULT_SHARED_CONFIG.cached_dump()
+
+
+def test_sample_config_data_is_read_only() -> None:
+    with pytest.raises(TypeError):
+        SAMPLE_CONFIG_DATA["machine_prices"]["NVIDIA B200"] = 0.0
+    with pytest.raises(TypeError):
+        ALTERED_CONFIG_DATA["gpu_architectures"]["NVIDIA B200"]["arch"] = "x"
+
+
+def test_cached_values_do_not_affect_equality() -> None:
+    cached = SharedConfig.model_validate(SAMPLE_CONFIG_DATA)
+    cached.cached_dump()
+    cached.lookup_driver_cuda(535)
+
+    assert cached == SharedConfig.model_validate(SAMPLE_CONFIG_DATA)
+
+
+def test_cached_values_recomputed_after_model_copy() -> None:
+    original = SharedConfig.model_validate(SAMPLE_CONFIG_DATA)
+    original.cached_dump()
+    original.lookup_driver_cuda(535)
+
+    for deep in (False, True):
+        copy = original.model_copy(update={"rental_fees_rate": 0.99, "driver_cuda_map": {600: 14.0}}, deep=deep)
+        assert copy.cached_dump()["rental_fees_rate"] == 0.99
+        assert copy.lookup_driver_cuda(610) == 14.0
+        assert copy.lookup_driver_cuda(535) is None
+
+    assert original.cached_dump()["rental_fees_rate"] == 0.9
+    assert original.lookup_driver_cuda(535) == 12.2
+
+
+def test_shared_config_equality_compares_content() -> None:
+    reordered = {**SAMPLE_CONFIG_DATA, "machine_prices": dict(reversed(SAMPLE_CONFIG_DATA["machine_prices"].items()))}
+    same = SharedConfig.model_validate(reordered)
+    altered = SharedConfig.model_validate(ALTERED_CONFIG_DATA)
+
+    assert same is not DEFAULT_SHARED_CONFIG
+    assert same == DEFAULT_SHARED_CONFIG
+    assert altered != DEFAULT_SHARED_CONFIG
+    assert DEFAULT_SHARED_CONFIG != SAMPLE_CONFIG_DATA
+    assert DEFAULT_SHARED_CONFIG.model_copy(update={"rental_fees_rate": 0.99}) != DEFAULT_SHARED_CONFIG
+
+
+def test_shared_config_accepts_non_json_nested_values() -> None:
+    gpu_architectures = {"NVIDIA B200": {"released": date(2024, 3, 18), "tags": {"sxm"}, 1: "mixed-keys"}}
+    config = SharedConfig.model_validate({**SAMPLE_CONFIG_DATA, "gpu_architectures": gpu_architectures})
+    assert config.gpu_architectures == gpu_architectures
+
+
+@pytest.mark.parametrize(
+    "driver, expected",
+    [
+        pytest.param(449, None, id="older_than_all"),
+        pytest.param(450, 11.0, id="exact_lowest"),
+        pytest.param(535, 12.2, id="exact_match"),
+        pytest.param(537, 12.2, id="between_versions"),
+        pytest.param(999, 13.1, id="newer_than_all"),
+    ],
+)
+def test_lookup_driver_cuda(driver: int, expected: float | None) -> None:
+    assert DEFAULT_SHARED_CONFIG.lookup_driver_cuda(driver) == expected
+
+
+def test_lookup_driver_cuda_after_json_validation() -> None:
+    config = SharedConfig.model_validate_json(_to_json({**SAMPLE_CONFIG_DATA, "driver_cuda_map": {"600": 14.0}}))
+    assert config.lookup_driver_cuda(610) == 14.0
+    assert config.lookup_driver_cuda(590) is None
+
+
 # ==================== Utils tests (dict_diff) ====================
 
 
@@ -81,92 +238,342 @@ def test_shared_config_serializes_to_json() -> None:
         pytest.param(
             {"a": 1},
             {"a": 2},
-            ["[a]: 1 -> 2"],
+            [("a", 1, 2)],
             id="top_level_change",
         ),
         pytest.param(
             {"a": {"b": 1}},
             {"a": {"b": 2}},
-            ["[a.b]: 1 -> 2"],
+            [("a.b", 1, 2)],
             id="nested_change",
         ),
         pytest.param(
             {"a": {"b": {"c": 1}}},
             {"a": {"b": {"c": 99}}},
-            ["[a.b.c]: 1 -> 99"],
+            [("a.b.c", 1, 99)],
             id="deep_nested_change",
         ),
         pytest.param(
             {},
             {"a": 1},
-            ["[a]: None -> 1"],
+            [("a", None, 1)],
             id="key_added",
         ),
         pytest.param(
             {"a": 1},
             {},
-            ["[a]: 1 -> None"],
+            [("a", 1, None)],
             id="key_removed",
         ),
         pytest.param(
             {"a": 1, "b": 2, "c": 3},
             {"a": 10, "b": 20, "c": 30},
-            ["[a]: 1 -> 10", "[b]: 2 -> 20", "[c]: 3 -> 30"],
+            [("a", 1, 10), ("b", 2, 20), ("c", 3, 30)],
             id="multiple_changes_sorted",
         ),
         pytest.param(
             {"a": {"nested": 1}},
             {"a": "flat"},
-            ["[a]: {'nested': 1} -> flat"],
+            [("a", {"nested": 1}, "flat")],
             id="dict_becomes_scalar",
         ),
+        pytest.param(
+            {"b": {"x": 1, "y": {"z": 1}}, "a": {"x": 1}},
+            {"b": {"x": 2, "y": {"z": 1}}, "a": {"x": 1}, "c": {"x": 1}},
+            [("b.x", 1, 2), ("c", None, {"x": 1})],
+            id="unchanged_subtrees_skipped",
+        ),
+        pytest.param(
+            {"driver_cuda_map": {90: 1.0, 450: 11.0, 1000: 13.0}},
+            {"driver_cuda_map": {90: 2.0, 450: 12.0, 1000: 14.0}},
+            [
+                ("driver_cuda_map.90", 1.0, 2.0),
+                ("driver_cuda_map.450", 11.0, 12.0),
+                ("driver_cuda_map.1000", 13.0, 14.0),
+            ],
+            id="int_keys_sorted_numerically",
+        ),
+        pytest.param(
+            {"a": {2: "x", "b": "y"}},
+            {"a": {2: "z", "b": "w"}},
+            [("a.2", "x", "z"), ("a.b", "y", "w")],
+            id="mixed_key_types",
+        ),
     ],
 )
-def test_dict_diff(old: dict, new: dict, expected: list[str]) -> None:
+def test_dict_diff(old: dict, new: dict, expected: list[tuple]) -> None:
     assert dict_diff(old, new) == expected
 
 
 # ==================== Client tests: _fetch ====================
 
 
-def test_fetch_success() -> None:
-    with patch("lium_core.shared_config.client.requests.get", return_value=_make_response(SAMPLE_CONFIG_DATA)):
-        client = _build_client(MagicMock())
+def test_fetch_success(default_client: SharedConfigClient) -> None:
+    assert isinstance(default_client.config, SharedConfig)
+    assert default_client.config == DEFAULT_SHARED_CONFIG
 
-    assert isinstance(client.config, SharedConfig)
-    assert client.config == DEFAULT_SHARED_CONFIG
+
+def test_fetch_hashes_streamed_chunks() -> None:
+    body = _to_json(ALTERED_CONFIG_DATA)
+    resp = _make_response(ALTERED_CONFIG_DATA)
+    resp.iter_content.return_value = [body[:100], body[100:]]
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=resp) as mock_get:
+        client = _build_client(mock_get)
+
+    assert mock_get.call_args.kwargs["stream"] is True
+    assert client.rental_fees_rate == 0.75
+    assert client._config_hash == hashlib.blake2b(body, digest_size=16).digest()
 
 
 def test_fetch_http_error() -> None:
-    with patch("lium_core.shared_config.client.requests.get", return_value=_make_response({}, status_code=500)):
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=_make_response({}, status_code=500)):
         client = _build_client(MagicMock())
 
     assert client.config == DEFAULT_SHARED_CONFIG
 
 
+def test_fetch_http_error_drains_body() -> None:
+    error = _make_response({}, status_code=500)
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=error):
+        client = _build_client(MagicMock())
+
+    error.iter_content.assert_called_once()
+    assert client._fetch_from_api() is None
+
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    """Serves SAMPLE_CONFIG_DATA with an ETag and answers 304 to matching conditional requests."""
+
+    protocol_version = "HTTP/1.1"
+    client_ports: list[int] = []
+
+    def do_GET(self) -> None:
+        self.client_ports.append(self.client_address[1])
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        body = _to_json(SAMPLE_CONFIG_DATA)
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def test_fetch_reuses_connection_after_304() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    server.daemon_threads = True
+    _ConditionalHandler.client_ports = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with patch("lium_core.shared_config.client.threading.Thread"):
+            client = SharedConfigClient(api_url=f"http://127.0.0.1:{server.server_port}/config")
+        for _ in range(4):
+            client._fetch_from_api()
+        client._session.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(_ConditionalHandler.client_ports) == 4
+    assert len(set(_ConditionalHandler.client_ports)) == 1
+
+
 def test_fetch_network_error() -> None:
-    with patch("lium_core.shared_config.client.requests.get", side_effect=requests.ConnectionError("no network")):
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("no network")):
         client = _build_client(MagicMock())
 
     assert client.config == DEFAULT_SHARED_CONFIG
 
 
+def test_fetch_network_error_logs_without_traceback(caplog: pytest.LogCaptureFixture) -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("no network")):
+        client = _build_client(MagicMock())
+        with caplog.at_level(logging.INFO, logger="lium_core.shared_config.client"):
+            for _ in range(9):
+                client._fetch()
+
+    failures = [r for r in caplog.records if r.getMessage().startswith("Failed to fetch")]
+    assert client._fail_count == 10
+    assert failures[0].getMessage().endswith("ConnectionError: no network")
+    assert not failures[0].exc_info
+    assert failures[-1].exc_info
+
+
+def test_fetch_success_resets_fail_count() -> None:
+    mock_get = MagicMock(side_effect=requests.ConnectionError("no network"))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        client = _build_client(mock_get)
+        assert client._fail_count == 1
+        mock_get.side_effect = None
+        mock_get.return_value = _make_response(SAMPLE_CONFIG_DATA)
+        client._fetch()
+
+    assert client._fail_count == 0
+
+
+def test_fetch_joins_inflight_request() -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("down")):
+        client = _build_client(MagicMock())
+
+    flight = _InFlight()
+    flight.result = SharedConfig.model_validate(ALTERED_CONFIG_DATA)
+    flight.done.set()
+    mock_get = MagicMock()
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.dict(SharedConfigClient._inflight, {API_URL: flight}),
+    ):
+        result = client._fetch()
+
+    mock_get.assert_not_called()
+    assert result is flight.result
+
+
+def test_fetch_releases_inflight_slot() -> None:
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        client = _build_client(mock_get)
+        assert client._fetch() is _UNCHANGED
+
+    assert API_URL not in SharedConfigClient._inflight
+
+
+def test_fetch_concurrent_callers_share_leader_config() -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("down")):
+        leader = _build_client(MagicMock())
+        follower = _build_client(MagicMock())
+
+    leader_result, follower_result, mock_get = _fetch_concurrently(
+        leader, follower, _make_response(ALTERED_CONFIG_DATA)
+    )
+
+    mock_get.assert_called_once()
+    assert isinstance(leader_result, SharedConfig)
+    assert leader_result.rental_fees_rate == 0.75
+    assert follower_result is leader_result
+    assert API_URL not in SharedConfigClient._inflight
+
+
+def test_fetch_concurrent_follower_gets_config_when_leader_unchanged() -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=_make_response(ALTERED_CONFIG_DATA)):
+        leader = _build_client(MagicMock())
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("down")):
+        follower = _build_client(MagicMock())
+
+    leader_result, follower_result, mock_get = _fetch_concurrently(
+        leader, follower, _make_response(ALTERED_CONFIG_DATA)
+    )
+
+    mock_get.assert_called_once()
+    assert leader_result is _UNCHANGED
+    assert follower_result is leader.config
+    assert API_URL not in SharedConfigClient._inflight
+
+
+def test_fetch_stops_waiting_on_stuck_flight() -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("down")):
+        client = _build_client(MagicMock())
+
+    mock_get = MagicMock(return_value=_make_response(ALTERED_CONFIG_DATA))
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.dict(SharedConfigClient._inflight, {API_URL: _InFlight()}),
+        patch("lium_core.shared_config.client._INFLIGHT_WAIT_TIMEOUT", 0.01),
+    ):
+        result = client._fetch()
+
+    mock_get.assert_called_once()
+    assert isinstance(result, SharedConfig)
+    assert result.rental_fees_rate == 0.75
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_gets_fresh_inflight_registry() -> None:
+    stale_lock = SharedConfigClient._inflight_lock
+    with patch.dict(SharedConfigClient._inflight, {API_URL: _InFlight()}), stale_lock:
+        pid = os.fork()
+        if pid == 0:  # child: never return into pytest
+            exit_code = 1
+            try:
+                if not SharedConfigClient._inflight and not SharedConfigClient._inflight_lock.locked():
+                    exit_code = 0
+            finally:
+                os._exit(exit_code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert SharedConfigClient._inflight_lock is stale_lock
+
+
+def test_fetch_follower_refetches_after_rollback() -> None:
+    validators = {"ETag": '"x"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=requests.ConnectionError("down")):
+        leader = _build_client(MagicMock())
+    with patch(
+        "lium_core.shared_config.client.requests.Session.get",
+        return_value=_make_response(SAMPLE_CONFIG_DATA, headers=validators),
+    ):
+        follower = _build_client(MagicMock())
+    assert follower._etag == '"x"'
+
+    # Server moves to the altered config; the follower adopts it through the leader's fetch
+    _, follower_config, _ = _fetch_concurrently(
+        leader, follower, _make_response(ALTERED_CONFIG_DATA), follower_refresh=True
+    )
+    assert follower_config.rental_fees_rate == 0.75
+    assert (follower._etag, follower._last_modified, follower._config_hash) == (None, None, None)
+
+    # Server rolls back to the original body: the follower must not treat it as unchanged
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA, headers=validators))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        follower._refresh()
+
+    assert mock_get.call_args.kwargs["headers"] == {}
+    assert follower.rental_fees_rate == 0.9
+    assert follower.config == DEFAULT_SHARED_CONFIG
+
+
 # ==================== Client tests: __init__ ====================
 
 
+def test_init_does_not_block_on_fetch() -> None:
+    mock_get = MagicMock(return_value=_make_response(ALTERED_CONFIG_DATA))
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch("lium_core.shared_config.client.threading.Thread") as mock_thread,
+    ):
+        client = SharedConfigClient(api_url=API_URL, refresh_interval=60)
+
+    mock_get.assert_not_called()
+    mock_thread.return_value.start.assert_called_once()
+    assert client.config is DEFAULT_SHARED_CONFIG
+    assert client.rental_fees_rate == DEFAULT_SHARED_CONFIG.rental_fees_rate
+    assert client.wait_until_ready(timeout=0) is False
+
+
 def test_init_with_successful_fetch() -> None:
-    with patch("lium_core.shared_config.client.requests.get", return_value=_make_response(ALTERED_CONFIG_DATA)):
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=_make_response(ALTERED_CONFIG_DATA)):
         client = _build_client(MagicMock())
 
     assert client.config.rental_fees_rate == 0.75
     assert client.config.collateral_days == 14
+    assert client.rental_fees_rate == 0.75
+    assert client.collateral_days == 14
+    assert client.wait_until_ready(timeout=0) is True
 
 
 def test_init_fallback_to_default() -> None:
-    with patch("lium_core.shared_config.client.requests.get", side_effect=Exception("boom")):
+    with patch("lium_core.shared_config.client.requests.Session.get", side_effect=Exception("boom")):
         client = _build_client(MagicMock())
 
     assert client.config is DEFAULT_SHARED_CONFIG
+    assert client.wait_until_ready(timeout=0) is False
 
 
 # ==================== Client tests: _refresh_loop ====================
@@ -174,75 +581,200 @@ def test_init_fallback_to_default() -> None:
 
 def test_refresh_updates_config_on_change() -> None:
     mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
-    with patch("lium_core.shared_config.client.requests.get", mock_get):
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
         client = _build_client(mock_get)
 
     assert client.config == DEFAULT_SHARED_CONFIG
 
     mock_get.return_value = _make_response(ALTERED_CONFIG_DATA)
 
-    def _stop_after_one_iteration(_interval: int) -> None:
-        client._running = False
-
     with (
-        patch("lium_core.shared_config.client.requests.get", mock_get),
-        patch("lium_core.shared_config.client.time.sleep", side_effect=_stop_after_one_iteration),
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
     ):
-        client._running = True
         client._refresh_loop()
 
     assert client.config.rental_fees_rate == 0.75
     assert client.config.collateral_days == 14
+    assert client.rental_fees_rate == 0.75
+    assert client.collateral_days == 14
 
 
-def test_refresh_skips_on_same_config(caplog: pytest.LogCaptureFixture) -> None:
+def test_refresh_logs_changes_in_one_record(caplog: pytest.LogCaptureFixture) -> None:
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        client = _build_client(mock_get)
+
+    mock_get.return_value = _make_response(ALTERED_CONFIG_DATA)
+
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
+        caplog.at_level(logging.INFO, logger="lium_core.shared_config.client"),
+    ):
+        client._refresh_loop()
+
+    [record] = [r for r in caplog.records if r.getMessage().startswith("Config changed")]
+    assert record.getMessage() == "Config changed:\n[collateral_days]: 7 -> 14\n[rental_fees_rate]: 0.9 -> 0.75"
+
+
+def test_refresh_skips_diff_when_info_disabled(caplog: pytest.LogCaptureFixture) -> None:
     mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
-    with patch("lium_core.shared_config.client.requests.get", mock_get):
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
         client = _build_client(mock_get)
 
-    def _stop_after_one_iteration(_interval: int) -> None:
-        client._running = False
+    mock_get.return_value = _make_response(ALTERED_CONFIG_DATA)
+
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
+        patch("lium_core.shared_config.client.dict_diff") as mock_diff,
+        caplog.at_level(logging.WARNING, logger="lium_core.shared_config.client"),
+    ):
+        client._refresh_loop()
+
+    mock_diff.assert_not_called()
+    assert client.rental_fees_rate == 0.75
+
+
+def test_refresh_skips_on_same_config(caplog: pytest.LogCaptureFixture) -> None:
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        client = _build_client(mock_get)
 
     with (
-        patch("lium_core.shared_config.client.requests.get", mock_get),
-        patch("lium_core.shared_config.client.time.sleep", side_effect=_stop_after_one_iteration),
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
         caplog.at_level(logging.DEBUG, logger="lium_core.shared_config.client"),
     ):
-        client._running = True
         client._refresh_loop()
 
     assert "unchanged" in caplog.text
 
 
+def test_refresh_skips_parsing_on_identical_body() -> None:
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        client = _build_client(mock_get)
+
+    original_config = client.config
+    same_body = _make_response(SAMPLE_CONFIG_DATA)
+    mock_get.return_value = same_body
+
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
+        patch.object(SharedConfig, "model_validate_json") as mock_validate,
+    ):
+        client._refresh_loop()
+
+    mock_validate.assert_not_called()
+    assert client.config is original_config
+
+
 def test_refresh_skips_on_fetch_failure() -> None:
     mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
-    with patch("lium_core.shared_config.client.requests.get", mock_get):
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
         client = _build_client(mock_get)
 
     original_config = client.config
     mock_get.side_effect = requests.ConnectionError("down")
 
-    def _stop_after_one_iteration(_interval: int) -> None:
-        client._running = False
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
+    ):
+        client._refresh_loop()
+
+    assert client.config is original_config
+
+
+def test_refresh_sends_conditional_headers_and_skips_on_304(caplog: pytest.LogCaptureFixture) -> None:
+    headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA, headers=headers))
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
+        client = _build_client(mock_get)
+
+    original_config = client.config
+    not_modified = _make_response({}, status_code=304)
+    mock_get.return_value = not_modified
 
     with (
-        patch("lium_core.shared_config.client.requests.get", mock_get),
-        patch("lium_core.shared_config.client.time.sleep", side_effect=_stop_after_one_iteration),
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]),
+        caplog.at_level(logging.DEBUG, logger="lium_core.shared_config.client"),
     ):
-        client._running = True
         client._refresh_loop()
 
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    assert not_modified.iter_content.called
     assert client.config is original_config
+    assert "unchanged" in caplog.text
 
 
 # ==================== Client tests: .config property ====================
 
 
-def test_config_property_returns_shared_config() -> None:
+def test_config_property_returns_shared_config(default_client: SharedConfigClient) -> None:
+    assert default_client.config.bittensor_netuid == DEFAULT_SHARED_CONFIG.bittensor_netuid
+    assert default_client.config.rental_fees_rate == DEFAULT_SHARED_CONFIG.rental_fees_rate
+    assert default_client.config.machine_prices == DEFAULT_SHARED_CONFIG.machine_prices
+
+
+def test_scalar_fields_mirrored_on_client(default_client: SharedConfigClient) -> None:
+    assert default_client.bittensor_netuid == DEFAULT_SHARED_CONFIG.bittensor_netuid
+    assert default_client.collateral_contract_address == DEFAULT_SHARED_CONFIG.collateral_contract_address
+    assert default_client.total_burn_emission == DEFAULT_SHARED_CONFIG.total_burn_emission
+
+
+# ==================== Client tests: session ====================
+
+
+def test_fetch_reuses_session() -> None:
     mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
-    with patch("lium_core.shared_config.client.requests.get", mock_get):
+    with patch("lium_core.shared_config.client.requests.Session.get", mock_get):
         client = _build_client(mock_get)
+        client._fetch()
+
+    assert mock_get.call_count == 2
+    assert client._session.headers["User-Agent"] == "lium-core"
+
+
+def test_session_retries_transient_errors(default_client: SharedConfigClient) -> None:
+    retries = default_client._session.get_adapter(API_URL.replace("http://", "https://")).max_retries
+    assert retries.total == 3
+    assert retries.backoff_factor == 0.3
+    assert set(retries.status_forcelist) == {502, 503, 504}
+    assert default_client._session.get_adapter(API_URL).max_retries is retries
+
+
+def test_stop_does_not_block_or_close_session() -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=_make_response(SAMPLE_CONFIG_DATA)):
+        client = _build_client(MagicMock())
+
+    with patch.object(client._session, "close") as mock_close:
+        client.stop()
+
+    assert client._stop_event.is_set()
+    client._thread.join.assert_not_called()
+    mock_close.assert_not_called()
+
+
+def test_refresh_loop_exits_after_stop_and_closes_session() -> None:
+    with patch("lium_core.shared_config.client.requests.Session.get", return_value=_make_response(SAMPLE_CONFIG_DATA)):
+        client = _build_client(MagicMock())
+
+    client.stop()
+
+    mock_get = MagicMock(return_value=_make_response(SAMPLE_CONFIG_DATA))
+    with (
+        patch("lium_core.shared_config.client.requests.Session.get", mock_get),
+        patch.object(client._session, "close") as mock_close,
+    ):
+        client._refresh_loop()  # only the initial fetch, then returns without waiting
 
-    assert client.config.bittensor_netuid == DEFAULT_SHARED_CONFIG.bittensor_netuid
-    assert client.config.rental_fees_rate == DEFAULT_SHARED_CONFIG.rental_fees_rate
-    assert client.config.machine_prices == DEFAULT_SHARED_CONFIG.machine_prices
+    mock_get.assert_called_once()
+    mock_close.assert_called_once()